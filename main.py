@@ -1,18 +1,36 @@
-from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import FileResponse, JSONResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from datetime import datetime
+from fastapi.middleware.gzip import GZipMiddleware
+from pydantic import BaseModel, Field
+from datetime import date, datetime
 import openpyxl
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
 from reportlab.lib.pagesizes import landscape, letter
+from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.pdfgen import canvas
+from reportlab.platypus import Paragraph
+from starlette.background import BackgroundTask
+import functools
+import hashlib
+import logging
 import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+import zipfile
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
+from xml.sax.saxutils import escape
+
+logger = logging.getLogger(__name__)
 
 # Create FastAPI app
-app = FastAPI(title="Maintenance Work Order System")
+app = FastAPI(title="Maintenance Work Order System", default_response_class=ORJSONResponse)
 
 # Configure CORS
 app.add_middleware(
@@ -23,6 +41,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+# Compress the work order list only
+class WorkOrderListGZipMiddleware:
+    """Gzip the work order list; PDF and XLSX downloads are already compressed."""
+
+    def __init__(self, app, minimum_size: int = 1024):
+        self.app = app
+        self.gzip_app = GZipMiddleware(app, minimum_size=minimum_size)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].startswith("/api/work-orders/"):
+            await self.gzip_app(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+
+app.add_middleware(WorkOrderListGZipMiddleware, minimum_size=1024)
+
 # Create directories if they don't exist
 UPLOAD_DIR = Path("uploads")
 REPORTS_DIR = Path("reports")
@@ -31,6 +67,12 @@ STATIC_DIR = Path("static")
 for dir_path in [UPLOAD_DIR, REPORTS_DIR, STATIC_DIR]:
     dir_path.mkdir(exist_ok=True)
 
+# SQLite database holding the work orders for every property
+DB_PATH = UPLOAD_DIR / "work_orders.db"
+WORK_ORDERS_SUFFIX = "_work_orders.xlsx"
+EXCEL_HEADERS = ["Room Number", "Work Order", "Completion Date", "Status", "Best Room"]
+WORK_ORDER_FIELDS = ("room_number", "work_order", "completion_date", "status", "best_room")
+
 # Mount static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
@@ -48,33 +90,366 @@ class RemoveWorkOrder(BaseModel):
     room_number: str
 
 
+class EditWorkOrder(BaseModel):
+    property_code: str = Field(min_length=1)
+    room_number: str = Field(min_length=1)
+    work_order: str = Field(min_length=1)
+    completion_date: date
+
+
+class RoomStatusUpdate(BaseModel):
+    property_code: str = Field(min_length=1)
+    room_number: str = Field(min_length=1)
+    status: str = Field(min_length=1)
+    best_room: str = "No"
+
+
 # Utility functions
-def ensure_excel_file(property_code: str) -> Path:
-    """Create or return path to Excel file for property."""
-    file_path = UPLOAD_DIR / f"{property_code}_work_orders.xlsx"
-    if not file_path.exists():
-        wb = openpyxl.Workbook()
-        sheet = wb.active
-        sheet.title = "Work Orders"
-        # Updated headers to include Best Room column
-        sheet.append(["Room Number", "Work Order", "Completion Date", "Status", "Best Room"])
-        wb.save(file_path)
-    return file_path
+def _open_ro(file_path: Path):
+    """Open an Excel file read-only for streaming row access."""
+    return openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+
+
+PROPERTY_NAMES = {
+    "NY198": "Comfort Inn & Suites",
+    "NY345": "Quality Inn & Suites"
+}
 
 
 def get_property_name(property_code: str) -> str:
     """Return property name based on code."""
-    return {
-        "NY198": "Comfort Inn & Suites",
-        "NY345": "Quality Inn & Suites"
-    }.get(property_code, "Unknown Property")
+    return PROPERTY_NAMES.get(property_code, "Unknown Property")
 
 
-def format_cell_date(cell) -> str:
+def format_cell_date(value) -> str:
     """Format date cell value to string."""
-    if isinstance(cell, datetime):
-        return cell.strftime("%Y-%m-%d")
-    return str(cell)
+    if isinstance(value, date):
+        return value.strftime("%Y-%m-%d")
+    return str(value)
+
+
+# Work order store
+def import_excel_file(conn: sqlite3.Connection, property_code: str, file_path: Path):
+    """Copy the work orders from an existing Excel file into the database."""
+    wb = _open_ro(file_path)
+    try:
+        values = wb.active.values
+        next(values, None)  # Skip header row
+
+        rows = []
+        for row in values:
+            if len(row) < 4 or any(value is None for value in row[:4]):  # Skip incomplete rows
+                continue
+            room_number, work_order, completion_date, status, *rest = row
+            rows.append((
+                property_code,
+                str(room_number),
+                str(work_order),
+                format_cell_date(completion_date),
+                str(status),
+                str(rest[0]) if rest and rest[0] else "No"
+            ))
+    finally:
+        wb.close()
+
+    conn.execute("INSERT OR IGNORE INTO properties (property_code) VALUES (?)", (property_code,))
+    conn.executemany("INSERT OR IGNORE INTO work_orders VALUES (?, ?, ?, ?, ?, ?)", rows)
+
+
+def _create_schema(conn: sqlite3.Connection):
+    """Create the work order tables and import any existing Excel files."""
+    # The composite primary key doubles as the (property_code, room_number) index
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS work_orders (
+            property_code TEXT NOT NULL,
+            room_number TEXT NOT NULL,
+            work_order TEXT NOT NULL,
+            completion_date TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'Pending',
+            best_room TEXT NOT NULL DEFAULT 'No',
+            PRIMARY KEY (property_code, room_number)
+        )
+    """)
+    # Every property that has a work order store, even with no rows left in it. The
+    # version is bumped with each write so every process can tell when rows changed.
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS properties (
+            property_code TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    conn.execute(
+        "INSERT OR IGNORE INTO properties (property_code) "
+        "SELECT DISTINCT property_code FROM work_orders"
+    )
+    for file_path in UPLOAD_DIR.glob(f"*{WORK_ORDERS_SUFFIX}"):
+        property_code = file_path.name.removesuffix(WORK_ORDERS_SUFFIX)
+        try:
+            import_excel_file(conn, property_code, file_path)
+        except Exception as e:
+            logger.warning("Skipping unreadable work order file %s: %s", file_path, e)
+
+
+def init_db() -> sqlite3.Connection:
+    """Open the work order database, importing existing Excel files on first run."""
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+    # WAL lets readers proceed during a write; NORMAL skips the fsync on every commit
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+
+    # Schema creation and the Excel import commit together and user_version marks
+    # completion, so a failed first start is retried instead of left half-initialized
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        if conn.execute("PRAGMA user_version").fetchone()[0] == 0:
+            _create_schema(conn)
+            conn.execute("PRAGMA user_version = 1")
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    return conn
+
+
+db = init_db()
+
+# All writes go through the single `db` connection, one transaction at a time
+_write_lock = threading.RLock()
+
+# Read connections are per threadpool thread so reads never wait on a writer
+_readers = threading.local()
+
+
+@contextmanager
+def write_transaction(property_code: str):
+    """Serialize a write to a property and bump its version in the same transaction."""
+    with _write_lock:
+        with db:
+            # Take SQLite's write lock up front so writers in other processes can't interleave
+            db.execute("BEGIN IMMEDIATE")
+            yield db
+            db.execute(
+                "INSERT INTO properties (property_code, version) VALUES (?, 1) "
+                "ON CONFLICT (property_code) DO UPDATE SET version = version + 1",
+                (property_code,)
+            )
+
+
+def _read_db() -> sqlite3.Connection:
+    """Return this thread's read-only database connection."""
+    conn = getattr(_readers, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(f"file:{DB_PATH}?mode=ro", uri=True)
+        _readers.conn = conn
+    return conn
+
+
+@functools.lru_cache(maxsize=64)
+def _load_rows(property_code: str, version: int) -> Dict[str, tuple]:
+    """Load a property's rows keyed by room number (cached per store version)."""
+    rows = _read_db().execute(
+        "SELECT room_number, work_order, completion_date, status, best_room "
+        "FROM work_orders WHERE property_code = ? ORDER BY rowid",
+        (property_code,)
+    )
+    return {row[0]: row for row in rows}
+
+
+def _property_version(property_code: str) -> Optional[int]:
+    """Return the property's stored version, or None if it has no work order store."""
+    row = _read_db().execute(
+        "SELECT version FROM properties WHERE property_code = ?", (property_code,)
+    ).fetchone()
+    return row[0] if row else None
+
+
+def get_rows(property_code: str) -> Dict[str, tuple]:
+    """Return the current rows for a property; the result must not be mutated."""
+    return _load_rows(property_code, _property_version(property_code) or 0)
+
+
+def property_exists(property_code: str) -> bool:
+    """Return whether the property is known, even if it has no work orders."""
+    return property_code in PROPERTY_NAMES or _property_version(property_code) is not None
+
+
+@functools.lru_cache(maxsize=64)
+def _rows_digest(property_code: str, version: int) -> str:
+    """Return a short digest identifying the property's rows at a given version."""
+    rows = _load_rows(property_code, version)
+    return hashlib.sha256(repr(list(rows.values())).encode()).hexdigest()[:16]
+
+
+def _replace_atomically(file_path: Path, write):
+    """Call write(tmp_path) and move the result over file_path in one step."""
+    # Write to a temporary file first so readers never see a partial file
+    fd, tmp_path = tempfile.mkstemp(dir=file_path.parent, suffix=f"{file_path.suffix}.tmp")
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+# Minimal OOXML parts for a single "Work Orders" sheet
+_XLSX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '</Types>'
+)
+_XLSX_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Target="xl/workbook.xml" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>'
+    '</Relationships>'
+)
+_XLSX_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="Work Orders" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+_XLSX_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Target="worksheets/sheet1.xml" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet"/>'
+    '</Relationships>'
+)
+
+
+def _xlsx_row(values) -> str:
+    """Render one sheet row with every value as an inline string cell."""
+    # Control characters are not allowed in XML 1.0 and would make the workbook unreadable
+    cells = "".join(
+        f'<c t="inlineStr"><is><t xml:space="preserve">'
+        f'{escape(ILLEGAL_CHARACTERS_RE.sub("", str(value)))}</t></is></c>'
+        for value in values
+    )
+    return f"<row>{cells}</row>"
+
+
+# Sheet XML up to and including the header row, rendered once at import
+_XLSX_SHEET_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+    + _xlsx_row(EXCEL_HEADERS)
+).encode()
+_XLSX_SHEET_TAIL = b'</sheetData></worksheet>'
+
+
+def _fast_write_xlsx(file_path: Path, rows):
+    """Write rows under the standard headers straight to XLSX XML, bypassing openpyxl."""
+    with zipfile.ZipFile(file_path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("[Content_Types].xml", _XLSX_CONTENT_TYPES)
+        zf.writestr("_rels/.rels", _XLSX_ROOT_RELS)
+        zf.writestr("xl/workbook.xml", _XLSX_WORKBOOK)
+        zf.writestr("xl/_rels/workbook.xml.rels", _XLSX_WORKBOOK_RELS)
+        with zf.open("xl/worksheets/sheet1.xml", "w") as sheet:
+            sheet.write(_XLSX_SHEET_HEAD)
+            for row in rows:
+                sheet.write(_xlsx_row(row).encode())
+            sheet.write(_XLSX_SHEET_TAIL)
+
+
+def export_excel_file(property_code: str) -> Path:
+    """Write the property's work orders to a temporary Excel file the caller must remove."""
+    # Kept out of UPLOAD_DIR, which is scanned for legacy files to import
+    fd, tmp_path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(fd)
+    try:
+        _fast_write_xlsx(Path(tmp_path), get_rows(property_code).values())
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return Path(tmp_path)
+
+
+# 10pt Helvetica with 12pt leading, matching the rest of the report rows
+WORK_ORDER_STYLE = getSampleStyleSheet()["BodyText"]
+
+
+# Superseded reports are kept this long after they were last served so downloads can finish
+STALE_REPORT_GRACE_SECONDS = 300
+
+
+def _remove_stale_reports(property_code: str, current_path: Path):
+    """Delete a property's superseded report renders that are past the grace period."""
+    report_name = re.compile(re.escape(f"{property_code}_maintenance_report_") + r"[0-9a-f]{16}\.pdf")
+    cutoff = time.time() - STALE_REPORT_GRACE_SECONDS
+    for file_path in REPORTS_DIR.iterdir():
+        if file_path == current_path or not report_name.fullmatch(file_path.name):
+            continue
+        try:
+            if file_path.stat().st_mtime < cutoff:
+                file_path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _render_pdf(file_path: Path, property_name: str, rows):
+    """Draw the maintenance report for the given rows into a PDF file."""
+    # Create PDF
+    c = canvas.Canvas(str(file_path), pagesize=landscape(letter))
+    width, height = landscape(letter)
+
+    # Add header
+    c.setFont("Helvetica-Bold", 18)
+    c.drawString(30, height - 50, f"Maintenance Report for {property_name}")
+    c.setFont("Helvetica", 12)
+    c.drawString(30, height - 70, f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+
+    # Draw header line
+    c.line(30, height - 85, width - 30, height - 85)
+
+    # Set up table headers
+    c.setFont("Helvetica-Bold", 12)
+    y_position = height - 120
+    col_positions = [30, 130, 380, 530]
+    headers = ["Room", "Work Order", "Completion Date", "Status"]
+
+    for pos, header in zip(col_positions, headers):
+        c.drawString(pos, y_position, header)
+
+    # Add line under headers
+    c.line(30, y_position - 15, width - 30, y_position - 15)
+
+    # Add work orders to PDF
+    y_position -= 40
+    c.setFont("Helvetica", 10)
+
+    for room_number, work_order_text, completion_date, status, _ in rows:
+        if y_position < 50:  # New page if needed
+            c.showPage()
+            c.setFont("Helvetica", 10)
+            y_position = height - 50
+
+        # Write row data
+        c.drawString(col_positions[0], y_position, room_number)
+
+        # Wrap work order text, with its first line on the row baseline
+        paragraph = Paragraph(escape(work_order_text), WORK_ORDER_STYLE)
+        _, text_height = paragraph.wrap(230, 200)
+        paragraph.drawOn(c, col_positions[1], y_position - text_height + WORK_ORDER_STYLE.fontSize)
+
+        # Continue with other columns
+        c.drawString(col_positions[2], y_position, completion_date)
+        c.drawString(col_positions[3], y_position, status)
+
+        y_position -= max(text_height, 20)
+
+    # Save PDF
+    c.save()
 
 
 @app.get("/")
@@ -84,7 +459,7 @@ async def read_root():
 
 
 @app.post("/api/work-orders")
-async def create_work_order(work_order: WorkOrder):
+def create_work_order(work_order: WorkOrder):
     """Create new work orders."""
     try:
         # Validate inputs
@@ -106,37 +481,39 @@ async def create_work_order(work_order: WorkOrder):
                 detail="Invalid date format. Use YYYY-MM-DD"
             )
 
-        # Get or create Excel file
-        file_path = ensure_excel_file(work_order.property_code)
-        wb = openpyxl.load_workbook(file_path)
-        sheet = wb.active
+        completion_date_text = completion_date.strftime("%Y-%m-%d")
+
+        property_code = work_order.property_code
 
         # Process each work order
-        for room_number, work_order_text in zip(room_numbers_list, work_orders_list):
-            # Check for existing work order
-            existing_row = None
-            for row in sheet.iter_rows(min_row=2):
-                if str(row[0].value) == room_number:
-                    existing_row = row
-                    break
-
-            if existing_row:
-                # Update existing work order
-                current_work_order = str(existing_row[1].value)
-                new_work_order = f"{current_work_order} / {work_order_text}"
-                existing_row[1].value = new_work_order
-                existing_row[2].value = completion_date
-            else:
-                # Create new work order
-                sheet.append([
-                    room_number,
-                    work_order_text,
-                    completion_date,
-                    "Pending"
-                ])
-
-        # Save changes
-        wb.save(file_path)
+        with write_transaction(property_code):
+            existing_rows = get_rows(property_code)
+            updates: Dict[str, str] = {}
+            appends: Dict[str, str] = {}
+
+            for room_number, work_order_text in zip(room_numbers_list, work_orders_list):
+                if room_number in existing_rows:
+                    # Update existing work order
+                    current_work_order = updates.get(room_number, existing_rows[room_number][1])
+                    updates[room_number] = f"{current_work_order} / {work_order_text}"
+                elif room_number in appends:
+                    # Room repeated within this request
+                    appends[room_number] = f"{appends[room_number]} / {work_order_text}"
+                else:
+                    # Create new work order
+                    appends[room_number] = work_order_text
+
+            db.executemany(
+                "UPDATE work_orders SET work_order = ?, completion_date = ? "
+                "WHERE property_code = ? AND room_number = ?",
+                [(text, completion_date_text, property_code, room) for room, text in updates.items()]
+            )
+            db.executemany(
+                "INSERT INTO work_orders (property_code, room_number, work_order, completion_date) "
+                "VALUES (?, ?, ?, ?)",
+                [(property_code, room, text, completion_date_text) for room, text in appends.items()]
+            )
+
         return {"status": "success", "message": "Work orders saved successfully"}
 
     except Exception as e:
@@ -144,129 +521,55 @@ async def create_work_order(work_order: WorkOrder):
 
 
 @app.post("/api/remove-work-order")
-async def remove_work_order(remove_order: RemoveWorkOrder):
+def remove_work_order(remove_order: RemoveWorkOrder):
     """Remove a work order for a specific room."""
     try:
-        file_path = UPLOAD_DIR / f"{remove_order.property_code}_work_orders.xlsx"
-        if not file_path.exists():
-            raise HTTPException(
-                status_code=404,
-                detail="No work orders found for this property"
+        with write_transaction(remove_order.property_code):
+            if remove_order.room_number not in get_rows(remove_order.property_code):
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"No work order found for room {remove_order.room_number}"
+                )
+
+            db.execute(
+                "DELETE FROM work_orders WHERE property_code = ? AND room_number = ?",
+                (remove_order.property_code, remove_order.room_number)
             )
 
-        wb = openpyxl.load_workbook(file_path)
-        sheet = wb.active
-
-        # Find and remove the work order
-        row_to_delete = None
-        for row in sheet.iter_rows(min_row=2):
-            if str(row[0].value) == remove_order.room_number:
-                row_to_delete = row[0].row
-                break
-
-        if row_to_delete:
-            sheet.delete_rows(row_to_delete)
-            wb.save(file_path)
-            return {
-                "status": "success",
-                "message": f"Work order for room {remove_order.room_number} removed successfully"
-            }
-        else:
-            raise HTTPException(
-                status_code=404,
-                detail=f"No work order found for room {remove_order.room_number}"
-            )
+        return {
+            "status": "success",
+            "message": f"Work order for room {remove_order.room_number} removed successfully"
+        }
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/generate-report/{property_code}")
-async def generate_report(property_code: str):
+def generate_report(property_code: str):
     """Generate PDF report for property work orders and display it inline."""
     try:
-        # Check for work orders file
-        file_path = UPLOAD_DIR / f"{property_code}_work_orders.xlsx"
-        if not file_path.exists():
+        # Load work orders
+        version = _property_version(property_code)
+        if version is None and property_code not in PROPERTY_NAMES:
             raise HTTPException(
                 status_code=404,
                 detail="No work orders found for this property"
             )
 
-        # Prepare PDF file
-        pdf_path = REPORTS_DIR / f"{property_code}_maintenance_report.pdf"
-        property_name = get_property_name(property_code)
-
-        # Create PDF
-        c = canvas.Canvas(str(pdf_path), pagesize=landscape(letter))
-        width, height = landscape(letter)
-
-        # Add header
-        c.setFont("Helvetica-Bold", 18)
-        c.drawString(30, height - 50, f"Maintenance Report for {property_name}")
-        c.setFont("Helvetica", 12)
-        c.drawString(30, height - 70, f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-
-        # Draw header line
-        c.line(30, height - 85, width - 30, height - 85)
-
-        # Set up table headers
-        c.setFont("Helvetica-Bold", 12)
-        y_position = height - 120
-        col_positions = [30, 130, 380, 530]
-        headers = ["Room", "Work Order", "Completion Date", "Status"]
-
-        for pos, header in zip(col_positions, headers):
-            c.drawString(pos, y_position, header)
-
-        # Add line under headers
-        c.line(30, y_position - 15, width - 30, y_position - 15)
-
-        # Load work orders
-        wb = openpyxl.load_workbook(file_path)
-        sheet = wb.active
-
-        # Add work orders to PDF
-        y_position -= 40
-        c.setFont("Helvetica", 10)
-
-        for row in sheet.iter_rows(min_row=2):
-            if y_position < 50:  # New page if needed
-                c.showPage()
-                c.setFont("Helvetica", 10)
-                y_position = height - 50
-
-            # Write row data
-            c.drawString(col_positions[0], y_position, str(row[0].value))
-
-            # Wrap work order text
-            work_order_text = str(row[1].value)
-            words = work_order_text.split()
-            lines = []
-            current_line = []
-
-            for word in words:
-                current_line.append(word)
-                if c.stringWidth(' '.join(current_line), "Helvetica", 10) > 230:
-                    current_line.pop()
-                    lines.append(' '.join(current_line))
-                    current_line = [word]
+        version = version or 0
+        rows = _load_rows(property_code, version)
 
-            if current_line:
-                lines.append(' '.join(current_line))
-
-            # Draw wrapped text
-            for i, line in enumerate(lines):
-                c.drawString(col_positions[1], y_position - (i * 12), line)
-
-            # Continue with other columns
-            c.drawString(col_positions[2], y_position, format_cell_date(row[2].value))
-            c.drawString(col_positions[3], y_position, str(row[3].value))
-
-            y_position -= max(len(lines) * 12, 20)
-
-        # Save PDF
-        c.save()
+        # Reports are named after their rows, so any process can reuse an unchanged one
+        pdf_path = REPORTS_DIR / f"{property_code}_maintenance_report_{_rows_digest(property_code, version)}.pdf"
+        try:
+            # Mark the cached report as just served so cleanup leaves it alone
+            os.utime(pdf_path)
+        except FileNotFoundError:
+            property_name = get_property_name(property_code)
+            _replace_atomically(pdf_path, lambda tmp_path: _render_pdf(tmp_path, property_name, rows.values()))
 
         # Return PDF file with Content-Disposition: inline for browser display
         return FileResponse(
@@ -274,9 +577,37 @@ async def generate_report(property_code: str):
             media_type="application/pdf",
             headers={
                 "Content-Disposition": f"inline; filename={property_code}_maintenance_report.pdf"
-            }
+            },
+            background=BackgroundTask(_remove_stale_reports, property_code, pdf_path)
         )
 
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/export/{property_code}")
+def export_work_orders(property_code: str):
+    """Export property work orders as an Excel download."""
+    try:
+        if not property_exists(property_code):
+            raise HTTPException(
+                status_code=404,
+                detail="No work orders found for this property"
+            )
+
+        file_path = export_excel_file(property_code)
+
+        return FileResponse(
+            file_path,
+            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            filename=f"{property_code}{WORK_ORDERS_SUFFIX}",
+            background=BackgroundTask(os.unlink, file_path)
+        )
+
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -290,117 +621,61 @@ def create_project_structure():
 
 
 @app.get("/api/work-orders/{property_code}")
-async def get_work_orders(property_code: str):
+def get_work_orders(property_code: str):
     """Get all work orders for a property."""
     try:
-        file_path = UPLOAD_DIR / f"{property_code}_work_orders.xlsx"
-        if not file_path.exists():
-            return {"work_orders": []}
-
-        wb = openpyxl.load_workbook(file_path)
-        sheet = wb.active
-
-        work_orders = []
-        for row in sheet.iter_rows(min_row=2):
-            if all(cell.value is not None for cell in row[:4]):  # Ensure row has data
-                work_orders.append({
-                    "room_number": str(row[0].value),
-                    "work_order": str(row[1].value),
-                    "completion_date": format_cell_date(row[2].value),
-                    "status": str(row[3].value),
-                    "best_room": str(row[4].value) if len(row) > 4 and row[4].value else "No"
-                })
+        work_orders = [
+            dict(zip(WORK_ORDER_FIELDS, row))
+            for row in get_rows(property_code).values()
+        ]
 
         return {"work_orders": work_orders}
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 @app.post("/api/edit-work-order")
-async def edit_work_order(request: Request):
+def edit_work_order(edit_order: EditWorkOrder):
     """Edit an existing work order."""
     try:
-        data = await request.json()
-        property_code = data.get('property_code')
-        room_number = data.get('room_number')
-        work_order = data.get('work_order')
-        completion_date = data.get('completion_date')
+        property_code = edit_order.property_code
+        room_number = edit_order.room_number
 
-        if not all([property_code, room_number, work_order, completion_date]):
-            raise HTTPException(status_code=400, detail="Missing required fields")
+        with write_transaction(property_code):
+            if room_number not in get_rows(property_code):
+                raise HTTPException(status_code=404, detail="Room not found")
 
-        try:
-            completion_date = datetime.strptime(completion_date, "%Y-%m-%d")
-        except ValueError:
-            raise HTTPException(
-                status_code=400,
-                detail="Invalid date format. Use YYYY-MM-DD"
+            db.execute(
+                "UPDATE work_orders SET work_order = ?, completion_date = ? "
+                "WHERE property_code = ? AND room_number = ?",
+                (edit_order.work_order, edit_order.completion_date.isoformat(), property_code, room_number)
             )
-
-        file_path = UPLOAD_DIR / f"{property_code}_work_orders.xlsx"
-        if not file_path.exists():
-            raise HTTPException(status_code=404, detail="Property not found")
-
-        wb = openpyxl.load_workbook(file_path)
-        sheet = wb.active
-
-        # Find and update the work order
-        found = False
-        for row in sheet.iter_rows(min_row=2):
-            if str(row[0].value) == room_number:
-                row[1].value = work_order  # Update work order
-                row[2].value = completion_date  # Update completion date
-                found = True
-                break
-
-        if not found:
-            raise HTTPException(status_code=404, detail="Room not found")
-
-        wb.save(file_path)
         return {"status": "success", "message": "Work order updated successfully"}
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/update-room-status")
-async def update_room_status(request: Request):
+def update_room_status(status_update: RoomStatusUpdate):
     """Update room status and best room designation."""
     try:
-        # Get JSON data from request body
-        data = await request.json()
-        property_code = data.get('property_code')
-        room_number = data.get('room_number')
-        status = data.get('status')
-        best_room = data.get('best_room', 'No')
-
-        if not all([property_code, room_number, status]):
-            raise HTTPException(status_code=400, detail="Missing required fields")
-
-        file_path = UPLOAD_DIR / f"{property_code}_work_orders.xlsx"
-        if not file_path.exists():
-            raise HTTPException(status_code=404, detail="Property not found")
-
-        wb = openpyxl.load_workbook(file_path)
-        sheet = wb.active
-
-        # Find and update the room
-        found = False
-        for row in sheet.iter_rows(min_row=2):
-            if str(row[0].value) == room_number:
-                row[3].value = status  # Update status
-                if len(row) > 4:
-                    row[4].value = best_room
-                else:
-                    # Add best_room column if it doesn't exist
-                    sheet.cell(row=row[0].row, column=5, value=best_room)
-                found = True
-                break
+        property_code = status_update.property_code
+        room_number = status_update.room_number
 
-        if not found:
-            raise HTTPException(status_code=404, detail="Room not found")
+        with write_transaction(property_code):
+            if room_number not in get_rows(property_code):
+                raise HTTPException(status_code=404, detail="Room not found")
 
-        wb.save(file_path)
+            db.execute(
+                "UPDATE work_orders SET status = ?, best_room = ? "
+                "WHERE property_code = ? AND room_number = ?",
+                (status_update.status, status_update.best_room, property_code, room_number)
+            )
         return {"status": "success", "message": "Room status updated successfully"}
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 